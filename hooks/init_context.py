@@ -12,9 +12,19 @@ import hashlib
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: journal appends are unlocked
+    fcntl = None
+
 STORE_DIR = Path.home() / ".claude" / ".session_store"
 PROJECTS_DIR = STORE_DIR / "projects"
 GLOBAL_CONTEXT = STORE_DIR / "global_context.json"
+PLANS_DIR = Path.home() / ".claude" / "plans"
+PLANS_CATALOG = STORE_DIR / "plans_catalog.json"
+INDEX_FILE = STORE_DIR / "context_index.json"
+INDEX_LOCK = STORE_DIR / "context_index.lock"
+INDEX_JOURNAL = STORE_DIR / "index_journal.log"
 
 def get_project_id(path):
     """Generate unique ID for a project folder"""
@@ -55,6 +65,72 @@ def load_global_context():
         "session_history": []
     }
 
+def plan_title(text, fallback):
+    """First markdown heading of a plan, or the fallback name"""
+    for line in text.splitlines():
+        if line.startswith("#"):
+            return line.lstrip("#").strip() or fallback
+    return fallback
+
+def refresh_plans_catalog(full=False):
+    """Incrementally refresh the plans catalog, re-reading only files whose
+    mtime or size changed. Unless `full`, an unchanged directory mtime skips the scan."""
+    catalog = {}
+    if PLANS_CATALOG.exists():
+        try:
+            with open(PLANS_CATALOG, 'r') as f:
+                catalog = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+    if not isinstance(catalog, dict) or not isinstance(catalog.get("plans", {}), dict):
+        catalog = {}
+    try:
+        dir_mtime = PLANS_DIR.stat().st_mtime_ns
+    except OSError:
+        return {"dir_mtime": None, "plans": {}}
+    if not full and catalog.get("dir_mtime") == dir_mtime:
+        return catalog
+
+    old_plans = catalog.get("plans", {})
+    plans = {}
+    for path in PLANS_DIR.glob("*.md"):
+        try:
+            st = path.stat()
+            entry = old_plans.get(path.name)
+            if isinstance(entry, dict) and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                plans[path.name] = entry
+                continue
+            data = path.read_bytes()
+        except OSError:
+            continue  # Removed or renamed since the glob
+        plans[path.name] = {
+            "title": plan_title(data.decode("utf-8", errors="replace"), path.stem),
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "hash": hashlib.sha256(data).hexdigest()[:16]
+        }
+    refreshed = {"dir_mtime": dir_mtime, "plans": plans}
+    if refreshed != catalog:
+        with open(PLANS_CATALOG, 'w') as f:
+            json.dump(refreshed, f, indent=2)
+    return refreshed
+
+def recent_plans(catalog, limit=None):
+    """Plan filenames, most recently modified first"""
+    plans = catalog.get("plans", {})
+    names = sorted(plans, key=lambda n: plans[n]["mtime"], reverse=True)
+    return names[:limit] if limit else names
+
+def mark_index_dirty(*relpaths):
+    """Tell the context-store server which files to re-index before its next query"""
+    if not INDEX_FILE.exists():
+        return  # No index yet; the server builds it from scratch
+    with open(INDEX_LOCK, 'a') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        with open(INDEX_JOURNAL, 'a') as f:
+            f.write("".join(f"{p}\n" for p in relpaths))
+
 def main():
     try:
         hook_input = json.load(sys.stdin)
@@ -80,11 +156,8 @@ def main():
         "session_count": len(project_context.get("sessions", []))
     }
 
-    # Load available plans
-    plans_dir = Path.home() / ".claude" / "plans"
-    available_plans = []
-    if plans_dir.exists():
-        available_plans = [p.name for p in list(plans_dir.glob("*.md"))[-10:]]
+    # Load available plans (catalog is only rescanned when the directory changed)
+    available_plans = recent_plans(refresh_plans_catalog(), limit=10)
 
     # Build session data
     session_data = {
@@ -112,6 +185,7 @@ def main():
     # Save updated global context
     with open(GLOBAL_CONTEXT, 'w') as f:
         json.dump(global_context, f, indent=2)
+    mark_index_dirty(GLOBAL_CONTEXT.name)
 
     output = {
         "continue": True,
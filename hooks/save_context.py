@@ -9,12 +9,29 @@ import sys
 import os
 import hashlib
 import re
+from array import array
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: journal appends are unlocked
+    fcntl = None
+
 STORE_DIR = Path.home() / ".claude" / ".session_store"
 PROJECTS_DIR = STORE_DIR / "projects"
 GLOBAL_CONTEXT = STORE_DIR / "global_context.json"
+COACCESS_DIR = STORE_DIR / "coaccess"
+INDEX_FILE = STORE_DIR / "context_index.json"
+INDEX_LOCK = STORE_DIR / "context_index.lock"
+INDEX_JOURNAL = STORE_DIR / "index_journal.log"
+
+# Co-access matrix tuning
+COACCESS_DECAY = 0.9            # weight kept per later session
+COACCESS_READ_WEIGHT = 0.5      # a read counts half as much as an edit
+COACCESS_MAX_FILES = 40         # files per session that enter the matrix
+COACCESS_MAX_ENTRIES = 20000    # nonzeros kept after compaction
+COACCESS_MIN_WEIGHT = 0.01      # decayed weights below this are dropped
 
 def get_project_id(path):
     return hashlib.md5(path.encode()).hexdigest()[:12]
@@ -37,6 +54,16 @@ def save_json(filepath, data):
     with open(filepath, 'w') as f:
         json.dump(data, f, indent=2)
 
+def mark_index_dirty(*relpaths):
+    """Tell the context-store server which files to re-index before its next query"""
+    if not INDEX_FILE.exists():
+        return  # No index yet; the server builds it from scratch
+    with open(INDEX_LOCK, 'a') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        with open(INDEX_JOURNAL, 'a') as f:
+            f.write("".join(f"{p}\n" for p in relpaths))
+
 def extract_session_context(transcript_path):
     """Extract useful context from the session transcript"""
     context = {
@@ -97,6 +124,89 @@ def extract_session_context(transcript_path):
 
     return context
 
+def load_coaccess(project_id):
+    """Load the sparse co-access matrix (upper triangle, COO arrays) for a project"""
+    data = load_json(COACCESS_DIR / f"{project_id}.json")
+    return {
+        "files": data.get("files", []),
+        "rows": array("i", data.get("rows", [])),
+        "cols": array("i", data.get("cols", [])),
+        "weights": array("d", data.get("weights", [])),
+        "scale": data.get("scale", 1.0),
+        "sessions": data.get("sessions", 0)
+    }
+
+def save_coaccess(project_id, matrix):
+    data = {
+        "files": matrix["files"],
+        "rows": matrix["rows"].tolist(),
+        "cols": matrix["cols"].tolist(),
+        "weights": [round(w, 6) for w in matrix["weights"]],
+        "scale": matrix["scale"],
+        "sessions": matrix["sessions"]
+    }
+    COACCESS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(COACCESS_DIR / f"{project_id}.json", 'w') as f:
+        json.dump(data, f, separators=(",", ":"))
+
+def compact_coaccess(matrix):
+    """Fold the decay scale into the weights, drop faded entries and unused files"""
+    scale = matrix["scale"]
+    entries = [(w / scale, r, c) for r, c, w in zip(matrix["rows"], matrix["cols"], matrix["weights"])
+               if w / scale >= COACCESS_MIN_WEIGHT]
+    entries.sort(reverse=True)
+    entries = entries[:COACCESS_MAX_ENTRIES]
+
+    used = sorted({r for _, r, _ in entries} | {c for _, _, c in entries})
+    remap = {old: new for new, old in enumerate(used)}
+    matrix["files"] = [matrix["files"][i] for i in used]
+    matrix["rows"] = array("i", [remap[r] for _, r, _ in entries])
+    matrix["cols"] = array("i", [remap[c] for _, _, c in entries])
+    matrix["weights"] = array("d", [w for w, _, _ in entries])
+    matrix["scale"] = 1.0
+
+def update_coaccess(matrix, files_edited, files_read):
+    """Decay existing weights and add one session's file pairs.
+    Decay is lazy: new increments are scaled up instead of shrinking every entry."""
+    touched = {}
+    for f in files_edited:
+        touched[f] = 1.0
+    for f in files_read:
+        touched.setdefault(f, COACCESS_READ_WEIGHT)
+    touched = list(touched.items())[:COACCESS_MAX_FILES]
+    if not touched:
+        return matrix
+
+    files = matrix["files"]
+    index = {f: i for i, f in enumerate(files)}
+    ids = []
+    for f, weight in touched:
+        if f not in index:
+            index[f] = len(files)
+            files.append(f)
+        ids.append((index[f], weight))
+
+    matrix["scale"] /= COACCESS_DECAY
+    scale = matrix["scale"]
+    rows, cols, weights = matrix["rows"], matrix["cols"], matrix["weights"]
+    position = {(r, c): n for n, (r, c) in enumerate(zip(rows, cols))}
+    for a, (i, wi) in enumerate(ids):
+        for j, wj in ids[a:]:
+            key = (min(i, j), max(i, j))
+            n = position.get(key)
+            if n is None:
+                position[key] = len(weights)
+                rows.append(key[0])
+                cols.append(key[1])
+                weights.append(min(wi, wj) * scale)
+            else:
+                weights[n] += min(wi, wj) * scale
+    matrix["sessions"] += 1
+
+    if scale > 1e6 or len(weights) > COACCESS_MAX_ENTRIES:
+        compact_coaccess(matrix)
+    return matrix
+
 def main():
     try:
         hook_input = json.load(sys.stdin)
@@ -136,6 +246,15 @@ def main():
     project_context["sessions"] = project_context["sessions"][-50:]
     project_context["last_session"] = datetime.now().isoformat()
 
+    # Update the file co-access matrix (replaying earlier sessions on first use)
+    coaccess_file = COACCESS_DIR / f"{project_id}.json"
+    matrix = load_coaccess(project_id)
+    if not coaccess_file.exists():
+        for past in project_context["sessions"][:-1]:
+            update_coaccess(matrix, past.get("files_edited", []), past.get("files_read", []))
+    update_coaccess(matrix, session_context["files_edited"], session_context["files_read"])
+    save_coaccess(project_id, matrix)
+
     # Accumulate frequently used files across sessions
     all_files = set(project_context.get("accumulated_files", []))
     all_files.update(session_context["files_edited"])
@@ -174,6 +293,7 @@ def main():
     global_context["session_history"] = global_context["session_history"][-100:]
 
     save_json(GLOBAL_CONTEXT, global_context)
+    mark_index_dirty(f"projects/{project_file.name}", GLOBAL_CONTEXT.name)
 
     # Summary output
     files_count = len(session_context["files_edited"])
@@ -13,6 +13,7 @@ from pathlib import Path
 STORE_DIR = Path.home() / ".claude" / ".session_store"
 CACHE_FILE = STORE_DIR / "permanent_cache.json"
 PROJECTS_DIR = STORE_DIR / "projects"
+COACCESS_DIR = STORE_DIR / "coaccess"
 
 def get_project_id(path):
     return hashlib.md5(path.encode()).hexdigest()[:12]
@@ -29,6 +30,43 @@ def load_project_context(cwd):
             return None
     return None
 
+def load_coaccess(cwd):
+    """Load the file co-access matrix built by save_context.py"""
+    coaccess_file = COACCESS_DIR / f"{get_project_id(cwd)}.json"
+    if coaccess_file.exists():
+        try:
+            return json.loads(coaccess_file.read_text())
+        except:
+            return None
+    return None
+
+def predict_files(matrix, recent, k=10):
+    """Rank files by decayed co-access weight with the recently used files.
+    Falls back to the most frequently touched files when nothing is connected."""
+    files = matrix.get("files", [])
+    scale = matrix.get("scale", 1.0) or 1.0
+    index = {f: i for i, f in enumerate(files)}
+    query = {index[f] for f in recent if f in index}
+    scores = {}
+    frequency = {}
+    for r, c, w in zip(matrix.get("rows", []), matrix.get("cols", []), matrix.get("weights", [])):
+        if r == c:
+            frequency[r] = w
+        elif r in query and c not in query:
+            scores[c] = scores.get(c, 0.0) + w
+        elif c in query and r not in query:
+            scores[r] = scores.get(r, 0.0) + w
+    if not scores:
+        scores = {i: w for i, w in frequency.items() if i not in query}
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    results = []
+    for i in ranked:
+        if os.path.exists(files[i]):
+            results.append((files[i], scores[i] / scale))
+            if len(results) >= k:
+                break
+    return results
+
 def load_priority_cache(cwd):
     """Load relevant priority cache entries"""
     project_name = Path(cwd).name.lower()
@@ -92,6 +130,20 @@ def main():
             for f in recent_files:
                 sections.append(f"  - {f}")
 
+        # Predict files likely needed next from the last session's edits
+        matrix = load_coaccess(cwd)
+        if matrix:
+            recent = []
+            for session in reversed(project_ctx.get("sessions", [])):
+                if session.get("files_edited"):
+                    recent = session["files_edited"]
+                    break
+            predicted = predict_files(matrix, recent, k=5)
+            if predicted:
+                sections.append(f"\nLikely next files:")
+                for f, _ in predicted:
+                    sections.append(f"  - {f}")
+
         # Show common commands (last 5)
         if commands:
             sections.append(f"\nCommon commands:")
@@ -11,15 +11,18 @@ echo "Installing Claude Code Context Cache System..."
 # Create directories
 mkdir -p "$CLAUDE_DIR/hooks"
 mkdir -p "$CLAUDE_DIR/mcp-servers/context-store"
+mkdir -p "$CLAUDE_DIR/scripts"
 mkdir -p "$CLAUDE_DIR/.session_store/projects"
 
 # Copy files
 cp "$SCRIPT_DIR/hooks/"*.py "$CLAUDE_DIR/hooks/"
 cp "$SCRIPT_DIR/mcp-servers/context-store/server.py" "$CLAUDE_DIR/mcp-servers/context-store/"
+cp "$SCRIPT_DIR/scripts/"*.py "$CLAUDE_DIR/scripts/"
 
 # Make executable
 chmod +x "$CLAUDE_DIR/hooks/"*.py
 chmod +x "$CLAUDE_DIR/mcp-servers/context-store/server.py"
+chmod +x "$CLAUDE_DIR/scripts/"*.py
 
 # Check if settings.json exists
 if [ -f "$CLAUDE_DIR/settings.json" ]; then
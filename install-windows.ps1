@@ -10,11 +10,13 @@ Write-Host "Installing Claude Code Context Cache System..."
 # Create directories
 New-Item -ItemType Directory -Force -Path "$ClaudeDir\hooks" | Out-Null
 New-Item -ItemType Directory -Force -Path "$ClaudeDir\mcp-servers\context-store" | Out-Null
+New-Item -ItemType Directory -Force -Path "$ClaudeDir\scripts" | Out-Null
 New-Item -ItemType Directory -Force -Path "$ClaudeDir\.session_store\projects" | Out-Null
 
 # Copy files
 Copy-Item "$ScriptDir\hooks\*.py" "$ClaudeDir\hooks\" -Force
 Copy-Item "$ScriptDir\mcp-servers\context-store\server.py" "$ClaudeDir\mcp-servers\context-store\" -Force
+Copy-Item "$ScriptDir\scripts\*.py" "$ClaudeDir\scripts\" -Force
 
 # Check if settings.json exists
 $SettingsPath = "$ClaudeDir\settings.json"
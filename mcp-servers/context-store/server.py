@@ -9,14 +9,31 @@ import json
 import sys
 import os
 import hashlib
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows: index files are updated without a lock
+    fcntl = None
+
 STORE_DIR = Path.home() / ".claude" / ".session_store"
 PROJECTS_DIR = STORE_DIR / "projects"
 GLOBAL_CONTEXT = STORE_DIR / "global_context.json"
 CACHE_FILE = STORE_DIR / "permanent_cache.json"
 PLANS_CACHE = STORE_DIR / "cached_plans.json"
+PLANS_DIR = Path.home() / ".claude" / "plans"
+PLANS_CATALOG = STORE_DIR / "plans_catalog.json"
+COACCESS_DIR = STORE_DIR / "coaccess"
+INDEX_FILE = STORE_DIR / "context_index.json"
+INDEX_LOG = STORE_DIR / "context_index.log"
+INDEX_LOCK = STORE_DIR / "context_index.lock"
+INDEX_JOURNAL = STORE_DIR / "index_journal.log"
+INDEX_LOG_MAX_BYTES = 1024 * 1024
+INDEX_FIELDS = ("priority", "stored_at", "size_chars", "last_accessed", "session_count")
 
 STORE_DIR.mkdir(parents=True, exist_ok=True)
 PROJECTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -38,11 +55,418 @@ def save_json(filepath, data):
     with open(filepath, 'w') as f:
         json.dump(data, f, indent=2)
 
+def plan_title(text, fallback):
+    for line in text.splitlines():
+        if line.startswith("#"):
+            return line.lstrip("#").strip() or fallback
+    return fallback
+
+def refresh_plans_catalog(full=False):
+    """Incrementally refresh the ~/.claude/plans catalog by mtime and size"""
+    catalog = load_json(PLANS_CATALOG)
+    if not isinstance(catalog, dict) or not isinstance(catalog.get("plans", {}), dict):
+        catalog = {}
+    try:
+        dir_mtime = PLANS_DIR.stat().st_mtime_ns
+    except OSError:
+        return {"dir_mtime": None, "plans": {}}
+    if not full and catalog.get("dir_mtime") == dir_mtime:
+        return catalog
+
+    old_plans = catalog.get("plans", {})
+    plans = {}
+    for path in PLANS_DIR.glob("*.md"):
+        try:
+            st = path.stat()
+            entry = old_plans.get(path.name)
+            if isinstance(entry, dict) and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                plans[path.name] = entry
+                continue
+            data = path.read_bytes()
+        except OSError:
+            continue  # Removed or renamed since the glob
+        plans[path.name] = {
+            "title": plan_title(data.decode("utf-8", errors="replace"), path.stem),
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "hash": hashlib.sha256(data).hexdigest()[:16]
+        }
+    refreshed = {"dir_mtime": dir_mtime, "plans": plans}
+    if refreshed != catalog:
+        save_json(PLANS_CATALOG, refreshed)
+    return refreshed
+
+def predict_files(matrix, recent, k=10):
+    """Rank files by decayed co-access weight with the recently used files.
+    Falls back to the most frequently touched files when nothing is connected."""
+    files = matrix.get("files", [])
+    scale = matrix.get("scale", 1.0) or 1.0
+    index = {f: i for i, f in enumerate(files)}
+    query = {index[f] for f in recent if f in index}
+    scores = {}
+    frequency = {}
+    for r, c, w in zip(matrix.get("rows", []), matrix.get("cols", []), matrix.get("weights", [])):
+        if r == c:
+            frequency[r] = w
+        elif r in query and c not in query:
+            scores[c] = scores.get(c, 0.0) + w
+        elif c in query and r not in query:
+            scores[r] = scores.get(r, 0.0) + w
+    if not scores:
+        scores = {i: w for i, w in frequency.items() if i not in query}
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    results = []
+    for i in ranked:
+        if os.path.exists(files[i]):
+            results.append((files[i], scores[i] / scale))
+            if len(results) >= k:
+                break
+    return results
+
+def index_records(relpath, data):
+    """Index records contributed by one store file, keyed by record id"""
+    records = {}
+    if relpath.startswith("projects/"):
+        pid = Path(relpath).stem
+        for key, entry in data.get("context", {}).items():
+            records[f"context/{pid}/{key}"] = {
+                "kind": "context", "project_id": pid, "key": key,
+                "priority": entry.get("priority"), "stored_at": entry.get("stored_at"),
+                "size_chars": len(str(entry.get("value", "")))
+            }
+    elif relpath == "global_context.json":
+        for pid, info in data.get("all_projects", {}).items():
+            records[f"project/{pid}"] = {
+                "kind": "project", "project_id": pid, "key": info.get("name"),
+                "last_accessed": info.get("last_accessed"), "session_count": info.get("session_count")
+            }
+    elif relpath == "permanent_cache.json":
+        for cid, entry in data.items():
+            records[f"priority/{cid}"] = {
+                "kind": "priority", "key": cid, "priority": entry.get("priority"),
+                "stored_at": entry.get("stored_at"), "size_chars": entry.get("size_chars")
+            }
+    elif relpath == "cached_plans.json":
+        for name, entry in data.items():
+            records[f"plan/{name}"] = {
+                "kind": "plan", "key": name,
+                "stored_at": entry.get("cached_at"), "size_chars": entry.get("size_chars")
+            }
+    for rec in records.values():
+        for field in ("priority", "size_chars", "session_count"):
+            try:
+                rec[field] = int(rec[field]) if rec.get(field) is not None else None
+            except (TypeError, ValueError):
+                rec[field] = None
+    return {rid: {k: v for k, v in rec.items() if v is not None} for rid, rec in records.items()}
+
+@contextmanager
+def index_lock():
+    """Serialise index snapshot, delta log and journal access across processes"""
+    with open(INDEX_LOCK, 'a') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+class ContextIndex:
+    """Sorted secondary indexes over store entries, kept in memory.
+    Persisted as a snapshot (context_index.json) plus an append-only delta log
+    (context_index.log) that is folded into the snapshot once it grows large.
+    Writers outside the server (hooks, sync) append changed files to
+    index_journal.log, which is applied on the next refresh."""
+
+    SOURCES = ["global_context.json", "permanent_cache.json", "cached_plans.json"]
+
+    def __init__(self):
+        self.snapshot_id = None
+        self.log_offset = 0
+        self._reset()
+
+    def _reset(self):
+        self.records = {}
+        self.sources = {}
+        self.sorted = {f: [] for f in INDEX_FIELDS}
+        self.kind_sorted = {}
+        self.by_project = {}
+        self.by_name = {}
+
+    def _add(self, rid, rec):
+        self.records[rid] = rec
+        by_kind = self.kind_sorted.setdefault(rec["kind"], {f: [] for f in INDEX_FIELDS})
+        for field in INDEX_FIELDS:
+            if field in rec:
+                insort(self.sorted[field], (rec[field], rid))
+                insort(by_kind[field], (rec[field], rid))
+        if "project_id" in rec:
+            self.by_project.setdefault(rec["project_id"], set()).add(rid)
+        if rec["kind"] == "project" and rec.get("key"):
+            self.by_name.setdefault(rec["key"], set()).add(rec["project_id"])
+
+    def _remove(self, rid):
+        rec = self.records.pop(rid)
+        for field in INDEX_FIELDS:
+            if field in rec:
+                for lst in (self.sorted[field], self.kind_sorted[rec["kind"]][field]):
+                    i = bisect_left(lst, (rec[field], rid))
+                    if i < len(lst) and lst[i] == (rec[field], rid):
+                        del lst[i]
+        if "project_id" in rec:
+            self.by_project.get(rec["project_id"], set()).discard(rid)
+        if rec["kind"] == "project" and rec.get("key"):
+            self.by_name.get(rec["key"], set()).discard(rec["project_id"])
+
+    def _set_source(self, relpath, records):
+        for rid in self.sources.pop(relpath, []):
+            if rid in self.records:
+                self._remove(rid)
+        for rid, rec in records.items():
+            if rid in self.records:
+                self._remove(rid)
+            self._add(rid, rec)
+        if records:
+            self.sources[relpath] = list(records)
+
+    def _apply_delta(self, relpath, changed, removed):
+        """Apply one source's changed and removed records"""
+        for rid in list(removed) + list(changed):
+            if rid in self.records:
+                self._remove(rid)
+        for rid, rec in changed.items():
+            self._add(rid, rec)
+        removed = set(removed)
+        ids = [rid for rid in self.sources.get(relpath, []) if rid not in removed]
+        known = set(ids)
+        ids += [rid for rid in changed if rid not in known]
+        if ids:
+            self.sources[relpath] = ids
+        else:
+            self.sources.pop(relpath, None)
+
+    def update_source(self, relpath, data):
+        """Re-index one store file after it was written"""
+        with index_lock():
+            self._refresh_locked()
+            self._reindex(relpath, data)
+
+    def refresh(self):
+        """Catch up with writes made by other processes"""
+        with index_lock():
+            self._refresh_locked()
+
+    def _refresh_locked(self):
+        try:
+            st = INDEX_FILE.stat()
+            snapshot_id = [st.st_ino, st.st_mtime_ns]
+        except OSError:
+            snapshot_id = None
+        if snapshot_id is None:
+            self._rebuild_locked()
+        elif snapshot_id != self.snapshot_id:
+            self._load_snapshot(snapshot_id)
+        self._read_log()
+        self._apply_journal()
+
+    def rebuild(self):
+        with index_lock():
+            self._rebuild_locked()
+
+    def _rebuild_locked(self):
+        self._reset()
+        sources = self.SOURCES + [f"projects/{p.name}" for p in PROJECTS_DIR.glob("*.json")]
+        for relpath in sources:
+            self._set_source(relpath, index_records(relpath, load_json(STORE_DIR / relpath)))
+        # The rebuild already covers anything the journal asked for
+        INDEX_JOURNAL.unlink(missing_ok=True)
+        self._compact()
+
+    def _load_snapshot(self, snapshot_id):
+        data = load_json(INDEX_FILE)
+        if not isinstance(data.get("records"), dict) or not isinstance(data.get("sources"), dict):
+            # Unreadable index: rebuild rather than start from an empty one
+            self._rebuild_locked()
+            return
+        self._reset()
+        self.records = data["records"]
+        self.sources = data["sources"]
+        for field in INDEX_FIELDS:
+            self.sorted[field] = sorted((rec[field], rid) for rid, rec in self.records.items() if field in rec)
+            for item in self.sorted[field]:
+                kind = self.records[item[1]]["kind"]
+                self.kind_sorted.setdefault(kind, {f: [] for f in INDEX_FIELDS})[field].append(item)
+        for rid, rec in self.records.items():
+            if "project_id" in rec:
+                self.by_project.setdefault(rec["project_id"], set()).add(rid)
+            if rec["kind"] == "project" and rec.get("key"):
+                self.by_name.setdefault(rec["key"], set()).add(rec["project_id"])
+        self.snapshot_id = snapshot_id
+        self.log_offset = 0
+
+    def _read_log(self):
+        try:
+            with open(INDEX_LOG, 'rb') as f:
+                f.seek(self.log_offset)
+                tail = f.read()
+        except OSError:
+            return
+        for line in tail.splitlines():
+            try:
+                delta = json.loads(line)
+            except ValueError:
+                continue
+            self._apply_delta(delta["source"], delta["set"], delta["removed"])
+        self.log_offset += len(tail)
+
+    def _reindex(self, relpath, data=None):
+        if data is None:
+            data = load_json(STORE_DIR / relpath)
+        records = index_records(relpath, data)
+        changed = {rid: rec for rid, rec in records.items() if self.records.get(rid) != rec}
+        removed = [rid for rid in self.sources.get(relpath, []) if rid not in records]
+        if not changed and not removed:
+            return
+        self._apply_delta(relpath, changed, removed)
+        delta = {"source": relpath, "set": changed, "removed": removed}
+        line = json.dumps(delta, separators=(",", ":")) + "\n"
+        with open(INDEX_LOG, 'a') as f:
+            f.write(line)
+        self.log_offset += len(line.encode())
+        if self.log_offset > INDEX_LOG_MAX_BYTES:
+            self._compact()
+
+    def _apply_journal(self):
+        try:
+            relpaths = set(INDEX_JOURNAL.read_text().split())
+        except OSError:
+            return
+        INDEX_JOURNAL.unlink()
+        for relpath in relpaths:
+            self._reindex(relpath)
+
+    def _compact(self):
+        """Fold the delta log into a fresh snapshot (write-then-rename)"""
+        tmp = INDEX_FILE.with_name(f"{INDEX_FILE.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump({"records": self.records, "sources": self.sources}, f, separators=(",", ":"))
+        os.replace(tmp, INDEX_FILE)
+        open(INDEX_LOG, 'w').close()
+        st = INDEX_FILE.stat()
+        self.snapshot_id = [st.st_ino, st.st_mtime_ns]
+        self.log_offset = 0
+
+    def _project_ids(self, projects):
+        if isinstance(projects, str):
+            projects = [projects]
+        pids = set()
+        for p in projects:
+            if p in self.by_project:
+                pids.add(p)
+            pids.update(self.by_name.get(p, ()))
+        return pids
+
+    def query(self, kind=None, min_priority=None, since=None, until=None, projects=None,
+              min_size=None, max_size=None, sort_by=None, descending=True, limit=20):
+        """Plan with index range counts: walk the sort index in order and stop
+        early, or scan the smallest range/project set and keep the top `limit`"""
+        self.refresh()
+        time_field = "last_accessed" if kind == "project" else "stored_at"
+        sort_by = sort_by or time_field
+        if sort_by not in INDEX_FIELDS:
+            raise ValueError(f"sort_by must be one of {', '.join(INDEX_FIELDS)}")
+
+        # Tool arguments may arrive as strings; the indexes hold ints
+        min_priority, min_size, max_size = (int(v) if v is not None else None
+                                            for v in (min_priority, min_size, max_size))
+        limit = int(limit)
+        if limit < 1:
+            return []
+        if isinstance(descending, str):
+            descending = descending.lower() not in ("false", "0", "no")
+
+        ranges = {}
+        if min_priority is not None:
+            ranges["priority"] = (min_priority, None)
+        if since or until:
+            # `until` is inclusive at its own precision: "2026-10-19" covers the whole day
+            ranges[time_field] = (since or None, until + "\U0010ffff" if until else None)
+        if min_size is not None or max_size is not None:
+            ranges["size_chars"] = (min_size, max_size)
+
+        # A kind filter selects that kind's own sorted lists
+        lists = self.kind_sorted.get(kind, {}) if kind else self.sorted
+        if not lists:
+            return []
+
+        def bounds(field, lo, hi):
+            lst = lists[field]
+            i = bisect_left(lst, (lo, "")) if lo is not None else 0
+            j = bisect_right(lst, (hi, "\U0010ffff")) if hi is not None else len(lst)
+            return i, max(i, j)
+
+        spans = {field: bounds(field, lo, hi) for field, (lo, hi) in ranges.items()}
+        pids = self._project_ids(projects) if projects else None
+        project_size = sum(len(self.by_project.get(pid, ())) for pid in pids) if pids is not None else None
+
+        # Estimated rows visited when walking the sort index until `limit` rows match
+        sort_i, sort_j = spans.get(sort_by, (0, len(lists[sort_by])))
+        selectivity = 1.0
+        for field, (i, j) in spans.items():
+            if field != sort_by:
+                selectivity *= (j - i) / max(len(lists[field]), 1)
+        if project_size is not None:
+            selectivity *= project_size / max(len(self.records), 1)
+        best_cost = min(sort_j - sort_i, limit / selectivity if selectivity else float("inf"))
+        driver = None
+        for field, (i, j) in spans.items():
+            if field != sort_by and j - i < best_cost:
+                best_cost, driver = j - i, (field, i, j)
+        if project_size is not None and project_size < best_cost:
+            driver = ("projects", 0, project_size)
+
+        def matches(rec):
+            if kind and rec["kind"] != kind:
+                return False
+            if pids is not None and rec.get("project_id") not in pids:
+                return False
+            if sort_by not in rec:
+                return False
+            for field, (lo, hi) in ranges.items():
+                if field not in rec:
+                    return False
+                if lo is not None and rec[field] < lo:
+                    return False
+                if hi is not None and rec[field] > hi:
+                    return False
+            return True
+
+        if driver is None:
+            # Walk the sort index in order and stop once `limit` rows match
+            lst = lists[sort_by]
+            positions = range(sort_j - 1, sort_i - 1, -1) if descending else range(sort_i, sort_j)
+            results = []
+            for n in positions:
+                rid = lst[n][1]
+                if matches(self.records[rid]):
+                    results.append(rid)
+                    if len(results) >= limit:
+                        break
+        else:
+            field, i, j = driver
+            if field == "projects":
+                candidates = (rid for pid in pids for rid in self.by_project.get(pid, ()))
+            else:
+                lst = lists[field]
+                candidates = (lst[n][1] for n in range(i, j))
+            hits = [rid for rid in candidates if matches(self.records[rid])]
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            results = pick(limit, hits, key=lambda rid: (self.records[rid][sort_by], rid))
+        return [(rid, self.records[rid]) for rid in results]
+
 class ContextStoreMCP:
     def __init__(self):
         self.cwd = os.getcwd()
         self.project_id = get_project_id(self.cwd)
         self.initialized = False
+        self.index = ContextIndex()
         self.tools = {
             "store_project_context": self.store_project_context,
             "get_project_context": self.get_project_context,
@@ -57,6 +481,8 @@ class ContextStoreMCP:
             "get_priority_content": self.get_priority_content,
             "get_session_history": self.get_session_history,
             "get_project_sessions": self.get_project_sessions,
+            "predict_files": self.predict_files,
+            "query_context": self.query_context,
         }
 
     def _get_project_file(self, project_id=None):
@@ -68,6 +494,7 @@ class ContextStoreMCP:
 
     def _save_project(self, data, project_id=None):
         save_json(self._get_project_file(project_id), data)
+        self.index.update_source(f"projects/{project_id or self.project_id}.json", data)
 
     def store_project_context(self, key: str, value: str, priority: int = 5) -> str:
         project = self._load_project()
@@ -139,17 +566,36 @@ class ContextStoreMCP:
             "size_chars": len(content)
         }
         save_json(PLANS_CACHE, data)
+        self.index.update_source(PLANS_CACHE.name, data)
         return f"Cached plan '{plan_name}' ({len(content):,} chars)"
 
     def get_cached_plan(self, plan_name: str) -> str:
         data = load_json(PLANS_CACHE)
-        return data.get(plan_name, {}).get("content", f"Plan not found: {plan_name}")
+        if plan_name in data:
+            return data[plan_name].get("content", "")
+        # Fall back to ~/.claude/plans; content is only read on request
+        plans = refresh_plans_catalog(full=True).get("plans", {})
+        for name in (plan_name, f"{plan_name}.md"):
+            if name in plans:
+                try:
+                    return (PLANS_DIR / name).read_text(encoding="utf-8", errors="replace")
+                except OSError:
+                    break
+        return f"Plan not found: {plan_name}"
 
     def list_cached_plans(self) -> str:
         data = load_json(PLANS_CACHE)
-        if not data:
+        plans = refresh_plans_catalog(full=True).get("plans", {})
+        if not data and not plans:
             return "No cached plans"
-        return "\n".join([f"- {n}: {i['size_chars']:,} chars" for n, i in data.items()])
+        result = [f"- {n}: {i['size_chars']:,} chars" for n, i in data.items()]
+        if plans:
+            result.append(f"Plans in {PLANS_DIR} (most recent first):")
+            for name in sorted(plans, key=lambda n: plans[n]["mtime"], reverse=True):
+                info = plans[name]
+                modified = datetime.fromtimestamp(info["mtime"] / 1e9).strftime("%Y-%m-%d %H:%M")
+                result.append(f"- {name}: {info['title']} ({info['size']:,} bytes, {modified})")
+        return "\n".join(result)
 
     def store_priority_content(self, content_id: str, content: str, description: str = "") -> str:
         data = load_json(CACHE_FILE)
@@ -161,6 +607,7 @@ class ContextStoreMCP:
             "size_chars": len(content)
         }
         save_json(CACHE_FILE, data)
+        self.index.update_source(CACHE_FILE.name, data)
         return f"Stored priority '{content_id}' ({len(content):,} chars) - NEVER deleted"
 
     def get_priority_content(self, content_id: str = None) -> str:
@@ -186,6 +633,35 @@ class ContextStoreMCP:
         return f"Project: {project.get('project_name', 'unknown')}\n" + \
                "\n".join([f"- {s['end_time']}" for s in sessions[-20:]])
 
+    def predict_files(self, files: list = None, k: int = 10, project_id: str = None) -> str:
+        pid = project_id or self.project_id
+        matrix = load_json(COACCESS_DIR / f"{pid}.json")
+        if not matrix.get("files"):
+            return "No co-access data for this project yet"
+        if files is None:
+            files = []
+            for session in reversed(self._load_project(pid).get("sessions", [])):
+                if session.get("files_edited"):
+                    files = session["files_edited"]
+                    break
+        predicted = predict_files(matrix, files, k)
+        if not predicted:
+            return "No predictions available"
+        return "\n".join([f"- {f} (score {score:.2f})" for f, score in predicted])
+
+    def query_context(self, kind: str = None, min_priority: int = None, since: str = None, until: str = None,
+                      projects: list = None, min_size: int = None, max_size: int = None,
+                      sort_by: str = None, descending: bool = True, limit: int = 20) -> str:
+        rows = self.index.query(kind, min_priority, since, until, projects, min_size, max_size,
+                                sort_by, descending, limit)
+        if not rows:
+            return "No matching entries"
+        result = []
+        for rid, rec in rows:
+            fields = " ".join(f"{f}={rec[f]}" for f in INDEX_FIELDS if f in rec)
+            result.append(f"- [{rec['kind']}] {rid} {fields}")
+        return "\n".join(result)
+
     def get_tools_list(self):
         return [
             {"name": "store_project_context", "description": "Store context for current project",
@@ -202,9 +678,9 @@ class ContextStoreMCP:
              "inputSchema": {"type": "object", "properties": {"key": {"type": "string"}}}},
             {"name": "cache_plan", "description": "Cache a development plan",
              "inputSchema": {"type": "object", "properties": {"plan_name": {"type": "string"}, "content": {"type": "string"}}, "required": ["plan_name", "content"]}},
-            {"name": "get_cached_plan", "description": "Get a cached plan",
+            {"name": "get_cached_plan", "description": "Get a cached plan or a plan file from ~/.claude/plans",
              "inputSchema": {"type": "object", "properties": {"plan_name": {"type": "string"}}, "required": ["plan_name"]}},
-            {"name": "list_cached_plans", "description": "List all cached plans",
+            {"name": "list_cached_plans", "description": "List cached plans and ~/.claude/plans files (most recent first)",
              "inputSchema": {"type": "object", "properties": {}}},
             {"name": "store_priority_content", "description": "Store priority content (never deleted)",
              "inputSchema": {"type": "object", "properties": {"content_id": {"type": "string"}, "content": {"type": "string"}, "description": {"type": "string"}}, "required": ["content_id", "content"]}},
@@ -213,7 +689,11 @@ class ContextStoreMCP:
             {"name": "get_session_history", "description": "Get global session history",
              "inputSchema": {"type": "object", "properties": {"limit": {"type": "integer", "default": 20}}}},
             {"name": "get_project_sessions", "description": "Get sessions for a project",
-             "inputSchema": {"type": "object", "properties": {"project_id": {"type": "string"}}}}
+             "inputSchema": {"type": "object", "properties": {"project_id": {"type": "string"}}}},
+            {"name": "query_context", "description": "Query entries across all projects by priority, time range, project set and size (sorted, limited). Entries without the sort field are skipped",
+             "inputSchema": {"type": "object", "properties": {"kind": {"type": "string", "enum": ["context", "priority", "plan", "project"]}, "min_priority": {"type": "integer"}, "since": {"type": "string", "description": "ISO timestamp (stored_at, or last_accessed for projects)"}, "until": {"type": "string", "description": "ISO timestamp or date, inclusive (a date covers the whole day)"}, "projects": {"type": "array", "items": {"type": "string"}, "description": "Project ids or names"}, "min_size": {"type": "integer"}, "max_size": {"type": "integer"}, "sort_by": {"type": "string", "enum": list(INDEX_FIELDS)}, "descending": {"type": "boolean", "default": True}, "limit": {"type": "integer", "default": 20}}}},
+            {"name": "predict_files", "description": "Predict files likely needed next from session co-access history",
+             "inputSchema": {"type": "object", "properties": {"files": {"type": "array", "items": {"type": "string"}, "description": "Recently edited files (defaults to the last session's edits)"}, "k": {"type": "integer", "default": 10}, "project_id": {"type": "string"}}}}
         ]
 
     def handle_request(self, request):
@@ -224,6 +704,11 @@ class ContextStoreMCP:
         # MCP Protocol: Initialize
         if method == "initialize":
             self.initialized = True
+            # Drain index updates queued by hooks since the last session
+            try:
+                self.index.refresh()
+            except Exception as e:
+                sys.stderr.write(f"Index refresh failed: {e}\n")
             return {
                 "protocolVersion": "2024-11-05",
                 "capabilities": {
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Store Sync - Incremental replication of ~/.claude/.session_store between machines.
+Files are split with content-defined chunking and summarised in a Merkle tree;
+only differing subtrees are walked and only missing chunks are transferred.
+Conflicting files are merged entry by entry using their stored_at timestamps.
+Deleted entries and files are recorded as tombstones in the manifest and kept
+for TOMBSTONE_TTL_DAYS; a peer that stays away longer will resurrect them.
+
+Usage:
+  sync_store.py sync /mnt/vm/.claude/.session_store
+  sync_store.py sync --remote "ssh devvm python3 ~/.claude/scripts/sync_store.py serve"
+  sync_store.py serve            (speaks the JSON-lines protocol on stdin/stdout)
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import shlex
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: journal appends are unlocked
+    fcntl = None
+
+STORE_DIR = Path.home() / ".claude" / ".session_store"
+SYNC_DIRNAME = ".sync"
+INDEX_JOURNAL_NAME = "index_journal.log"
+INDEX_LOCK_NAME = "context_index.lock"
+
+# Machine-local files that must never be replicated
+LOCAL_ONLY = {"current_session.json", "live_session.json", "plans_catalog.json", "context_index.json"}
+
+# Deletions older than this are forgotten
+TOMBSTONE_TTL_DAYS = 90
+
+# Content-defined chunking parameters (average chunk ~2.5KB: CHUNK_MIN + 2**CHUNK_BITS)
+CHUNK_MIN = 512
+CHUNK_MAX = 16384
+CHUNK_BITS = 11
+GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], "big") for i in range(256)]
+MASK64 = (1 << 64) - 1
+
+def sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+def chunk_bytes(data):
+    """Split data at content-defined boundaries (gear rolling hash).
+    The boundary test uses the high bits, which depend on the last 64 bytes;
+    the low bits of a shift-left hash only see the last few bytes."""
+    chunks = []
+    start = 0
+    h = 0
+    n = len(data)
+    i = 0
+    while i < n:
+        h = ((h << 1) + GEAR[data[i]]) & MASK64
+        i += 1
+        size = i - start
+        if (size >= CHUNK_MIN and not (h >> (64 - CHUNK_BITS))) or size >= CHUNK_MAX:
+            chunks.append(data[start:i])
+            start = i
+            h = 0
+    if start < n:
+        chunks.append(data[start:])
+    return chunks
+
+def leaf_hash(chunk_ids, deleted=None, removed_at=None):
+    return sha(json.dumps([chunk_ids, sorted((deleted or {}).items()), removed_at or ""]).encode())
+
+def dir_hash(children):
+    return sha(json.dumps(sorted(children.items())).encode())
+
+def tree_path(relpath):
+    """Place project files under two 16-way buckets so one change touches O(log N) nodes"""
+    if relpath.startswith("projects/"):
+        name = relpath[len("projects/"):]
+        bucket = sha(name.encode())
+        return f"projects/{bucket[0]}/{bucket[1]}/{name}"
+    return relpath
+
+def store_path(treepath):
+    if treepath.startswith("projects/"):
+        return "projects/" + treepath.rpartition("/")[2]
+    return treepath
+
+# ---------------------------------------------------------------------------
+# Entry-level merge
+# ---------------------------------------------------------------------------
+
+def newer(a, b, field):
+    """Pick the entry with the later timestamp; local (a) wins ties"""
+    if b.get(field, "") > a.get(field, ""):
+        return b
+    return a
+
+def merge_keyed(a, b, field):
+    merged = dict(a)
+    for key, entry in b.items():
+        if key not in merged:
+            merged[key] = entry
+        elif isinstance(merged[key], dict) and isinstance(entry, dict):
+            merged[key] = newer(merged[key], entry, field)
+    return merged
+
+def merge_list(a, b, key, order_field, limit):
+    seen = {}
+    for item in a + b:
+        if isinstance(item, dict):
+            seen.setdefault(key(item), item)
+    merged = sorted(seen.values(), key=lambda item: item.get(order_field, ""))
+    return merged[-limit:]
+
+def merge_ordered(a, b, limit):
+    merged = list(a)
+    for item in b:
+        if item not in merged:
+            merged.append(item)
+    return merged[-limit:]
+
+def merge_project(a, b):
+    base, other = (a, b) if a.get("last_session", "") >= b.get("last_session", "") else (b, a)
+    merged = dict(other)
+    merged.update(base)
+    merged["context"] = merge_keyed(a.get("context", {}), b.get("context", {}), "stored_at")
+    merged["cached_content"] = merge_keyed(a.get("cached_content", {}), b.get("cached_content", {}), "stored_at")
+    merged["sessions"] = merge_list(a.get("sessions", []), b.get("sessions", []),
+                                    lambda s: s.get("session_id") or s.get("end_time"), "end_time", 50)
+    merged["accumulated_files"] = merge_ordered(a.get("accumulated_files", []), b.get("accumulated_files", []), 100)
+    merged["accumulated_commands"] = merge_ordered(a.get("accumulated_commands", []), b.get("accumulated_commands", []), 50)
+    return merged
+
+def merge_global(a, b):
+    merged = dict(b)
+    merged.update(a)
+    merged["all_projects"] = merge_keyed(a.get("all_projects", {}), b.get("all_projects", {}), "last_accessed")
+    merged["global_cache"] = merge_keyed(a.get("global_cache", {}), b.get("global_cache", {}), "stored_at")
+    merged["session_history"] = merge_list(a.get("session_history", []), b.get("session_history", []),
+                                           lambda s: (s.get("project_id"), s.get("end_time")), "end_time", 100)
+    return merged
+
+def merge_store_file(relpath, local, remote):
+    """Merge two versions of a store file at the entry level"""
+    if not isinstance(remote, dict):
+        return local
+    if not isinstance(local, dict):
+        return remote
+    if relpath.startswith("projects/"):
+        return merge_project(local, remote)
+    if relpath == "global_context.json":
+        return merge_global(local, remote)
+    if relpath == "cached_plans.json":
+        return merge_keyed(local, remote, "cached_at")
+    return merge_keyed(local, remote, "stored_at")
+
+# ---------------------------------------------------------------------------
+# Tombstones
+# ---------------------------------------------------------------------------
+
+def keyed_sections(relpath, data):
+    """(section, entries) pairs of a store file; section "" means top-level keys"""
+    if not isinstance(data, dict):
+        return []
+    if relpath.startswith("projects/"):
+        names = ("context", "cached_content")
+    elif relpath == "global_context.json":
+        names = ("all_projects", "global_cache")
+    else:
+        return [("", data)]
+    return [(name, data[name]) for name in names if isinstance(data.get(name), dict)]
+
+def stamp_field(relpath, section):
+    if relpath == "cached_plans.json":
+        return "cached_at"
+    if section == "all_projects":
+        return "last_accessed"
+    return "stored_at"
+
+def entry_keys(relpath, data):
+    return {f"{section}/{key}" if section else key
+            for section, entries in keyed_sections(relpath, data) for key in entries}
+
+def latest_stamp(relpath, data):
+    stamps = [data.get("last_session", "")]
+    for section, entries in keyed_sections(relpath, data):
+        field = stamp_field(relpath, section)
+        stamps += [e.get(field, "") for e in entries.values() if isinstance(e, dict)]
+    return max(stamps)
+
+def merge_tombstones(a, b):
+    merged = dict(a)
+    for key, ts in b.items():
+        merged[key] = max(ts, merged.get(key, ""))
+    return merged
+
+def apply_tombstones(relpath, data, deleted, removed_at=None):
+    """Drop entries not written after their tombstone (or after the file was removed)"""
+    for section, entries in keyed_sections(relpath, data):
+        field = stamp_field(relpath, section)
+        for key in list(entries):
+            entry = entries[key]
+            stamp = entry.get(field, "") if isinstance(entry, dict) else ""
+            tomb = deleted.get(f"{section}/{key}" if section else key)
+            if (tomb and stamp <= tomb) or (removed_at and stamp <= removed_at):
+                del entries[key]
+    return data
+
+def parse_json(data):
+    if data is None:
+        return None
+    try:
+        return json.loads(data.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def dump_json(data):
+    return json.dumps(data, indent=2).encode("utf-8")
+
+# ---------------------------------------------------------------------------
+# Peers
+# ---------------------------------------------------------------------------
+
+class DirPeer:
+    """A store directory with its chunk cache and Merkle tree"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.sync_dir = self.root / SYNC_DIRNAME
+        self.chunk_dir = self.sync_dir / "chunks"
+        self.manifest_file = self.sync_dir / "manifest.json"
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            self.manifest = json.loads(self.manifest_file.read_text())
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.files = self.manifest.get("files", {})
+        self.scan()
+
+    def _tracked(self):
+        paths = [p for p in self.root.glob("*.json") if p.name not in LOCAL_ONLY]
+        paths += list((self.root / "projects").glob("*.json"))
+        return paths
+
+    def _chunk_path(self, cid):
+        return self.chunk_dir / cid[:2] / cid
+
+    def has_chunk(self, cid):
+        return self._chunk_path(cid).exists()
+
+    def _store_chunks(self, data):
+        ids = []
+        for chunk in chunk_bytes(data):
+            cid = sha(chunk)
+            path = self._chunk_path(cid)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(chunk)
+            ids.append(cid)
+        return ids
+
+    def _entry(self, path, chunks, deleted, removed_at=None):
+        st = path.stat() if not removed_at else None
+        entry = {"mtime": st.st_mtime_ns if st else None, "size": st.st_size if st else None,
+                 "chunks": chunks, "deleted": deleted, "hash": leaf_hash(chunks, deleted, removed_at)}
+        if removed_at:
+            entry["removed_at"] = removed_at
+        return entry
+
+    def scan(self):
+        """Re-chunk only files whose mtime or size changed, then rebuild the tree.
+        Entries or files that disappeared since the last scan become tombstones."""
+        now = datetime.now().isoformat()
+        current = {}
+        for path in self._tracked():
+            rel = path.relative_to(self.root).as_posix()
+            st = path.stat()
+            entry = self.files.get(rel)
+            if (entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size
+                    and all(self.has_chunk(c) for c in entry["chunks"])):
+                current[rel] = entry
+                continue
+            data = path.read_bytes()
+            deleted = dict((entry or {}).get("deleted", {}))
+            if entry and entry["chunks"] and all(self.has_chunk(c) for c in entry["chunks"]):
+                old, new = parse_json(self.assemble(entry["chunks"])), parse_json(data)
+                if new is not None:
+                    for key in entry_keys(rel, old) - entry_keys(rel, new):
+                        deleted[key] = now
+            current[rel] = self._entry(path, self._store_chunks(data), deleted)
+        for rel, entry in self.files.items():
+            if rel not in current:
+                removed_at = entry.get("removed_at") or now
+                current[rel] = self._entry(self.root / rel, [], entry.get("deleted", {}), removed_at)
+        self.files = current
+        self._build_tree()
+
+    def _build_tree(self):
+        self.nodes = {}
+        dirs = {"": {}}
+        for rel, entry in self.files.items():
+            path = tree_path(rel)
+            self.nodes[path] = self._leaf(entry)
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                dirs.setdefault("/".join(parts[:depth]), {})
+            parent = "/".join(parts[:-1])
+            dirs[parent][parts[-1]] = entry["hash"]
+        # Hash directories deepest-first so parents see their children's hashes
+        for path in sorted(dirs, key=lambda p: -p.count("/") if p else 1):
+            children = dirs[path]
+            node = {"hash": dir_hash(children), "children": children}
+            self.nodes[path] = node
+            if path:
+                parent, _, name = path.rpartition("/")
+                dirs[parent][name] = node["hash"]
+
+    def _leaf(self, entry):
+        return {"hash": entry["hash"], "chunks": entry["chunks"],
+                "deleted": entry.get("deleted", {}), "removed_at": entry.get("removed_at")}
+
+    # Peer protocol ----------------------------------------------------------
+
+    def node(self, path):
+        return self.nodes.get(path)
+
+    def missing(self, chunk_ids):
+        return [c for c in chunk_ids if not self.has_chunk(c)]
+
+    def get_chunks(self, chunk_ids):
+        return {c: self._chunk_path(c).read_bytes() for c in chunk_ids}
+
+    def put_chunks(self, chunks):
+        for cid, data in chunks.items():
+            if sha(data) != cid:
+                raise ValueError(f"Chunk hash mismatch: {cid}")
+            path = self._chunk_path(cid)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+    def put_file(self, relpath, chunk_ids, deleted=None, removed_at=None):
+        if removed_at:
+            self.remove_file(relpath, removed_at, deleted or {})
+        else:
+            self.write_file(relpath, self.assemble(chunk_ids), deleted)
+
+    def finish(self):
+        """Expire old tombstones, persist the manifest and drop unreferenced chunks"""
+        cutoff = (datetime.now() - timedelta(days=TOMBSTONE_TTL_DAYS)).isoformat()
+        for rel in list(self.files):
+            entry = self.files[rel]
+            if entry.get("removed_at", cutoff) < cutoff:
+                del self.files[rel]
+                continue
+            deleted = {k: ts for k, ts in entry.get("deleted", {}).items() if ts >= cutoff}
+            if deleted != entry.get("deleted", {}):
+                entry["deleted"] = deleted
+                entry["hash"] = leaf_hash(entry["chunks"], deleted, entry.get("removed_at"))
+        self.sync_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_file.write_text(json.dumps({"files": self.files}))
+        live = {c for entry in self.files.values() for c in entry["chunks"]}
+        for path in self.chunk_dir.glob("*/*"):
+            if path.name not in live:
+                path.unlink()
+
+    # Local helpers ----------------------------------------------------------
+
+    def assemble(self, chunk_ids):
+        return b"".join(self._chunk_path(c).read_bytes() for c in chunk_ids)
+
+    def read_file(self, relpath):
+        path = self.root / relpath
+        return path.read_bytes() if path.exists() else None
+
+    def _mark_index_dirty(self, relpath):
+        """Let the context-store server re-index this file"""
+        if not (self.root / "context_index.json").exists():
+            return
+        with open(self.root / INDEX_LOCK_NAME, "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            with open(self.root / INDEX_JOURNAL_NAME, "a") as f:
+                f.write(relpath + "\n")
+
+    def remove_file(self, relpath, removed_at, deleted):
+        path = self.root / relpath
+        if path.exists():
+            path.unlink()
+            self._mark_index_dirty(relpath)
+        self.files[relpath] = self._entry(path, [], deleted, removed_at)
+        self.nodes[tree_path(relpath)] = self._leaf(self.files[relpath])
+
+    def write_file(self, relpath, data, deleted=None):
+        path = self.root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        self._mark_index_dirty(relpath)
+        if deleted is None:
+            deleted = self.files.get(relpath, {}).get("deleted", {})
+        chunks = self._store_chunks(data)
+        self.files[relpath] = self._entry(path, chunks, deleted)
+        self.nodes[tree_path(relpath)] = self._leaf(self.files[relpath])
+        return chunks
+
+class StreamPeer:
+    """A remote store reached through a `serve` process over stdin/stdout"""
+
+    def __init__(self, command):
+        self.proc = subprocess.Popen(shlex.split(command), stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def _call(self, op, **args):
+        line = json.dumps({"op": op, "args": args}).encode() + b"\n"
+        self.bytes_sent += len(line)
+        self.proc.stdin.write(line)
+        self.proc.stdin.flush()
+        reply = self.proc.stdout.readline()
+        if not reply:
+            raise RuntimeError("Remote sync process closed the stream")
+        self.bytes_received += len(reply)
+        response = json.loads(reply)
+        if "error" in response:
+            raise RuntimeError(f"Remote error: {response['error']}")
+        return response.get("result")
+
+    def node(self, path):
+        return self._call("node", path=path)
+
+    def missing(self, chunk_ids):
+        return self._call("missing", chunk_ids=chunk_ids)
+
+    def get_chunks(self, chunk_ids):
+        encoded = self._call("get_chunks", chunk_ids=chunk_ids)
+        return {c: base64.b64decode(d) for c, d in encoded.items()}
+
+    def put_chunks(self, chunks):
+        encoded = {c: base64.b64encode(d).decode() for c, d in chunks.items()}
+        self._call("put_chunks", chunks=encoded)
+
+    def put_file(self, relpath, chunk_ids, deleted=None, removed_at=None):
+        self._call("put_file", relpath=relpath, chunk_ids=chunk_ids, deleted=deleted, removed_at=removed_at)
+
+    def finish(self):
+        self._call("finish")
+        self.proc.stdin.close()
+        self.proc.wait()
+
+def serve(store, instream=None, outstream=None):
+    """Answer peer requests for `store` as JSON lines until EOF or `finish`"""
+    instream = instream or sys.stdin
+    outstream = outstream or sys.stdout
+    peer = DirPeer(store)
+    for line in instream:
+        line = line.strip()
+        if not line:
+            continue
+        request = {}
+        try:
+            request = json.loads(line)
+            op, args = request.get("op"), request.get("args", {})
+            if op == "get_chunks":
+                result = {c: base64.b64encode(d).decode() for c, d in peer.get_chunks(args["chunk_ids"]).items()}
+            elif op == "put_chunks":
+                result = peer.put_chunks({c: base64.b64decode(d) for c, d in args["chunks"].items()})
+            elif op in ("node", "missing", "put_file", "finish"):
+                result = getattr(peer, op)(**args)
+            else:
+                raise ValueError(f"Unknown op: {op}")
+            response = {"result": result}
+        except Exception as e:
+            response = {"error": str(e)}
+        outstream.write(json.dumps(response) + "\n")
+        outstream.flush()
+        if request.get("op") == "finish":
+            break
+
+# ---------------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------------
+
+def join(path, name):
+    return f"{path}/{name}" if path else name
+
+def diff_trees(local, remote, path="", in_local=True, in_remote=True):
+    """Walk both Merkle trees, comparing child hashes from the parent reply and
+    fetching only subtrees whose hashes differ. Returns changed leaf paths."""
+    if path.endswith(".json"):
+        return [path]
+    a = local.node(path) if in_local else None
+    b = remote.node(path) if in_remote else None
+    a_children = (a or {}).get("children", {})
+    b_children = (b or {}).get("children", {})
+    changed = []
+    for name in sorted(set(a_children) | set(b_children)):
+        if a_children.get(name) != b_children.get(name):
+            changed += diff_trees(local, remote, join(path, name),
+                                  name in a_children, name in b_children)
+    return changed
+
+def sync(local, remote):
+    """Two-way sync; returns a summary dict"""
+    stats = {"files": [], "chunks_received": 0, "chunks_sent": 0, "bytes_received": 0, "bytes_sent": 0}
+    for path in diff_trees(local, remote):
+        relpath = store_path(path)
+        local_node = local.node(path) or {}
+        remote_node = remote.node(path) or {}
+        remote_data = None
+        if remote_node.get("chunks"):
+            need = local.missing(remote_node["chunks"])
+            if need:
+                received = remote.get_chunks(need)
+                local.put_chunks(received)
+                stats["chunks_received"] += len(received)
+                stats["bytes_received"] += sum(len(d) for d in received.values())
+            remote_data = local.assemble(remote_node["chunks"])
+
+        local_data = local.read_file(relpath)
+        deleted = merge_tombstones(local_node.get("deleted", {}), remote_node.get("deleted", {}))
+        removed_at = max(local_node.get("removed_at") or "", remote_node.get("removed_at") or "") or None
+        merged = merge_store_file(relpath, parse_json(local_data), parse_json(remote_data))
+        if merged is None and not removed_at:
+            continue
+        if merged is not None:
+            merged = apply_tombstones(relpath, merged, deleted, removed_at)
+            # A file removed on one side survives only if it was written to afterwards
+            if removed_at and latest_stamp(relpath, merged) > removed_at:
+                removed_at = None
+
+        if removed_at:
+            data, chunks = None, []
+            if (local_data is not None or local_node.get("removed_at") != removed_at
+                    or local_node.get("deleted", {}) != deleted):
+                local.remove_file(relpath, removed_at, deleted)
+        else:
+            data = dump_json(merged)
+            if data != local_data or local_node.get("deleted", {}) != deleted:
+                chunks = local.write_file(relpath, data, deleted)
+            else:
+                chunks = local_node["chunks"]
+
+        if (data != remote_data or remote_node.get("deleted", {}) != deleted
+                or remote_node.get("removed_at") != removed_at):
+            need = remote.missing(chunks) if chunks else []
+            if need:
+                sent = local.get_chunks(need)
+                remote.put_chunks(sent)
+                stats["chunks_sent"] += len(sent)
+                stats["bytes_sent"] += sum(len(d) for d in sent.values())
+            remote.put_file(relpath, chunks, deleted, removed_at)
+        stats["files"].append(relpath)
+    local.finish()
+    remote.finish()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally sync a context store with a peer")
+    parser.add_argument("--store", default=str(STORE_DIR), help="Local store directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_cmd = sub.add_parser("sync", help="Two-way sync with a peer directory or remote command")
+    sync_cmd.add_argument("peer", nargs="?", help="Peer store directory")
+    sync_cmd.add_argument("--remote", help="Command that starts `sync_store.py serve` on the peer")
+    sub.add_parser("serve", help="Serve the local store over stdin/stdout")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.store)
+        return
+
+    if bool(args.peer) == bool(args.remote):
+        parser.error("sync needs exactly one of PEER or --remote")
+    local = DirPeer(args.store)
+    remote = StreamPeer(args.remote) if args.remote else DirPeer(args.peer)
+    stats = sync(local, remote)
+    print(f"Synced {len(stats['files'])} files | "
+          f"received {stats['chunks_received']} chunks ({stats['bytes_received']:,} bytes) | "
+          f"sent {stats['chunks_sent']} chunks ({stats['bytes_sent']:,} bytes)")
+    for relpath in stats["files"]:
+        print(f"  - {relpath}")
+
+if __name__ == "__main__":
+    main()